@@ -1,10 +1,10 @@
-import math
-import pandas as pd
+import numpy as np
 from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Font
 from openpyxl.utils import get_column_letter
 import argparse
 import sys
+import zipfile
+from xml.sax.saxutils import escape
 from datetime import datetime
 
 class TeeLogger:
@@ -21,49 +21,313 @@ class TeeLogger:
         self.log.flush()
 
 
-def run_staffing_model(input_excel, output_excel):
-
-    def is_empty_day(df, d):
-        required = ["demand", "trainees", "crnas", "faculty"]
-        for r in required:
-            if r not in df.index:
-                return True
-            if pd.isna(df.loc[r, d]):
-                return True
-        return False
-
-    def round_half_up(x):
-        """
-        Custom rounding:
-        - decimal >= 0.5 → round up
-        - decimal < 0.5 → round down
-        """
-        if x == "" or x is None:
-            return ""
-        return math.floor(x + 0.5)
-
-    def round_1_decimal(x):
-        if x == "" or x is None:
-            return ""
-        return round(x, 1)
-
-
-    df = pd.read_excel(input_excel, index_col=0)
-    df.index = df.index.str.strip().str.lower()
-    dates = list(df.columns)
+REQUIRED_ROWS = ("demand", "trainees", "crnas", "faculty")
+REQ_IDX = {name: i for i, name in enumerate(REQUIRED_ROWS)}
+
+# Fixed faculty, the same for every date
+CARDIAC_FAC = 3     # 1:1 cardiac rooms
+NL_FAC = 5          # NL faculty
+ASC_CD_FAC = 1      # ASC CD
+
+
+def read_input_rows(input_excel, labels=REQUIRED_ROWS):
+    """
+    Read the date header and only the requested rows of the input sheet.
+
+    Returns (dates, rows) where rows maps each lower-cased label found
+    in the first column to a tuple of its values, aligned with dates.
+    """
+    wb = load_workbook(input_excel, read_only=True, data_only=True)
+    try:
+        it = wb.active.iter_rows(values_only=True)
+        header = next(it, ())
+        dates = list(header[1:])
+        while dates and dates[-1] is None:
+            dates.pop()
+        n = len(dates)
+
+        rows = {}
+        for values in it:
+            if not values or values[0] is None:
+                continue
+            label = str(values[0]).strip().lower()
+            if label in labels:
+                cells = tuple(values[1:n + 1])
+                rows[label] = cells + (None,) * (n - len(cells))
+    finally:
+        wb.close()
+
+    return dates, rows
+
+
+# ---------------------------------------------------------
+# XLSX output
+# ---------------------------------------------------------
+# The report is a fixed layout of labels and numbers with a handful of
+# fills, so the package is written directly: every part except the sheet
+# is static (TEMPLATE_PARTS), and sheetData is built with one join.
+
+# Style ids are indexes into <cellXfs> in STYLES_XML
+STYLE_YELLOW = 1
+STYLE_BLUE = 2
+STYLE_GREEN = 3
+STYLE_BOLD = 4
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Staffing" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="5">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00FFF200"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00CFEAF7"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00E3F4D7"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="3" borderId="0" xfId="0" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="4" borderId="0" xfId="0" applyFill="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+SHEET_HEAD_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<cols>{cols}</cols>'
+    '<sheetData>'
+)
+
+COL_XML = '<col min="{c}" max="{c}" width="16" customWidth="1"/>'
+
+SHEET_TAIL_XML = '</sheetData></worksheet>'
+
+# Static members of the .xlsx package, copied as-is into every report
+TEMPLATE_PARTS = {
+    "[Content_Types].xml": CONTENT_TYPES_XML,
+    "_rels/.rels": ROOT_RELS_XML,
+    "xl/workbook.xml": WORKBOOK_XML,
+    "xl/_rels/workbook.xml.rels": WORKBOOK_RELS_XML,
+    "xl/styles.xml": STYLES_XML,
+}
+
+
+def write_report_xlsx(output_excel, rows, max_col, used_cols=None):
+    """
+    Write the report grid as a single-sheet .xlsx.
+
+    rows is a list of rows (row 1 first), each a list of max_col entries
+    that are either None or a (value, style_id) tuple. used_cols lists
+    the 1-based columns that can hold cells (default: all of them).
+    """
+    if used_cols is None:
+        used_cols = range(1, max_col + 1)
+
+    # The column schedule is fixed for the whole sheet, so resolve it once:
+    # each used slot with its '<c r="<letter>' prefix already formatted.
+    slots = [(c - 1, f'<c r="{get_column_letter(c)}') for c in used_cols]
+    style_attrs = {
+        style: f' s="{style}"'
+        for style in (STYLE_YELLOW, STYLE_BLUE, STYLE_GREEN, STYLE_BOLD)
+    }
+    style_attrs[None] = ""
+
+    widths = "".join(COL_XML.format(c=c) for c in range(2, max_col + 1))
+    xml = [SHEET_HEAD_XML.format(cols=widths)]
+    append = xml.append
+
+    for r, cells in enumerate(rows, start=1):
+        row_start = len(xml)
+        append(f'<row r="{r}">')
+        for i, open_ref in slots:
+            cell = cells[i]
+            if cell is None:
+                continue
+            value, style = cell
+            head = f'{open_ref}{r}"{style_attrs[style]}'
+
+            if value is None or value == "":
+                if style:
+                    append(f'{head}/>')
+            elif isinstance(value, str):
+                append(
+                    f'{head} t="inlineStr">'
+                    f'<is><t>{escape(value)}</t></is></c>'
+                )
+            else:
+                # Same number formatting as openpyxl (8.0 is written as 8)
+                append(f'{head}><v>{"%.16g" % value}</v></c>')
+
+        if len(xml) == row_start + 1:
+            xml.pop()  # no cells in this row
+        else:
+            append("</row>")
+
+    append(SHEET_TAIL_XML)
+
+    with zipfile.ZipFile(output_excel, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, part in TEMPLATE_PARTS.items():
+            zf.writestr(name, part)
+        zf.writestr("xl/worksheets/sheet1.xml", "".join(xml))
+
+
+def int_where(values, mask):
+    """
+    values as an object array, with the entries under mask as Python ints.
+
+    The per-date steps mix ints and floats like the original per-date
+    loop did: min(x / 2 - 1.5, faculty) keeps faculty as an int when it
+    is the smaller one, so those cells print as 8 rather than 8.0.
+    """
+    out = values.astype(object)
+    out[mask] = values[mask].astype(np.int64).tolist()
+    return out
+
+
+def compute_staffing_days(
+    demand, trainees, crnas, faculty,
+    cardiac_faculty=CARDIAC_FAC, nl_fac=NL_FAC, asc_cd_faculty=ASC_CD_FAC,
+):
+    """
+    Staffing math for every date at once.
+
+    Takes one int array per input row (aligned with the dates) and
+    returns a dict of equally long arrays, one per computed quantity.
+    Dates are independent, so no value depends on another date.
+    """
+    scheduled_flex_crnas = np.maximum(crnas, 0)
+
+    # -------- Trainee coverage --------
+    trainee_rooms = np.minimum(trainees, demand)
+    raw_trainee_faculty = trainee_rooms / 2 - 1.5
+    # Where faculty is the (strictly) smaller value the result stays an int
+    trainee_capped = faculty < raw_trainee_faculty
+    faculty_for_trainees = np.round(
+        np.minimum(raw_trainee_faculty, faculty), 1
+    )
+    rooms_after_trainees = demand - trainee_rooms
+    faculty_after_trainees = faculty - faculty_for_trainees
+
+    # -------- CRNA coverage --------
+    crna_rooms = np.minimum(scheduled_flex_crnas, rooms_after_trainees)
+    raw_crna_faculty = crna_rooms / 3.5
+    # Remaining faculty is only an int if the trainee step kept it one
+    crna_capped = trainee_capped & (faculty_after_trainees < raw_crna_faculty)
+    faculty_for_crnas = np.round(
+        np.minimum(raw_crna_faculty, faculty_after_trainees), 1
+    )
+    rooms_after_crnas = rooms_after_trainees - crna_rooms
+    faculty_after_crnas = faculty_after_trainees - faculty_for_crnas
+
+    # -------- Solo faculty --------
+    # solo_faculty = min(available_faculty, available_rooms)
+    solo_faculty = rooms_after_crnas
+
+    # -------- Faculty summary --------
+    supervisory = cardiac_faculty + faculty_for_trainees + faculty_for_crnas
+    addition_faculty_supervisory = supervisory + solo_faculty
+    # Custom rounding: decimal >= 0.5 → round up, < 0.5 → round down
+    faculty_needed = np.floor(supervisory + solo_faculty + 0.5).astype(np.int64)
+    final_faculty_required = faculty_needed + 2 + asc_cd_faculty
+    overage_faculty = faculty - final_faculty_required
+
+    mor_asc_sat = final_faculty_required - nl_fac
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_solo = np.where(
+            mor_asc_sat > 0,
+            np.rint((solo_faculty / mor_asc_sat) * 100),
+            0,
+        ).astype(np.int64)
+
+    # -------- CRNA summary --------
+    crna_demand = demand - trainee_rooms - solo_faculty
+    crna_needed = crna_demand - scheduled_flex_crnas
+    difference = demand - trainees - crna_rooms
+
+    return {
+        "scheduled_flex_crnas": scheduled_flex_crnas,
+        "trainee_rooms": trainee_rooms,
+        "faculty_for_trainees": int_where(faculty_for_trainees, trainee_capped),
+        "rooms_after_trainees": rooms_after_trainees,
+        "faculty_after_trainees": int_where(faculty_after_trainees, trainee_capped),
+        "crna_rooms": crna_rooms,
+        "faculty_for_crnas": int_where(faculty_for_crnas, crna_capped),
+        "rooms_after_crnas": rooms_after_crnas,
+        "faculty_after_crnas": int_where(faculty_after_crnas, crna_capped),
+        "solo_faculty": solo_faculty,
+        "supervisory": int_where(supervisory, crna_capped),
+        "addition_faculty_supervisory": int_where(
+            addition_faculty_supervisory, crna_capped
+        ),
+        "faculty_needed": faculty_needed,
+        "final_faculty_required": final_faculty_required,
+        "overage_faculty": overage_faculty,
+        "mor_asc_sat": mor_asc_sat,
+        "percent_solo": percent_solo,
+        "crna_demand": crna_demand,
+        "crna_needed": crna_needed,
+        "difference": difference,
+    }
+
+
+def run_staffing_model(input_excel, output_excel, verbose=False):
+
+    dates, rows = read_input_rows(input_excel)
+
+    # One float matrix (REQUIRED_ROWS x dates); blanks and missing rows are NaN
+    mat = np.full((len(REQUIRED_ROWS), len(dates)), np.nan)
+    for name, values in rows.items():
+        mat[REQ_IDX[name]] = [np.nan if v is None else v for v in values]
 
     # ---------------- Excel styles ----------------
-    yellow = PatternFill("solid", fgColor="FFF200")
-    blue = PatternFill("solid", fgColor="CFEAF7")
-    green = PatternFill("solid", fgColor="E3F4D7")
-    bold = Font(bold=True)
-
-    out_wb = load_workbook(input_excel)
-    ws = out_wb.active
-
-    # Clear worksheet
-    ws.delete_rows(1, ws.max_row)
-    ws.delete_cols(1, ws.max_column)
+    yellow = STYLE_YELLOW
+    blue = STYLE_BLUE
+    green = STYLE_GREEN
+    bold = STYLE_BOLD
 
     # ---------------- Column layout ----------------
     col_positions = {}
@@ -73,39 +337,47 @@ def run_staffing_model(input_excel, output_excel):
         col += 1
         if (i + 1) % 5 == 0:
             col += 1  # weekly gap
+    cols = [col_positions[d] for d in dates]
+    max_col = cols[-1] if cols else 2
+    col_idx = [c - 1 for c in cols]  # 0-based slots in a buffered row
+
+    # Cells are buffered per row and written out in order at the end
+    rows_buffer = []
+
+    def buffered_row(r):
+        while len(rows_buffer) < r:
+            rows_buffer.append([None] * max_col)
+        return rows_buffer[r - 1]
+
+    def set_cell(r, c, value, style=None):
+        buffered_row(r)[c - 1] = (value, style)
 
     # ---------------- Headers ----------------
-    for d, c in col_positions.items():
-        ws.cell(row=1, column=c).value = d.strftime("%d-%b")
-        ws.cell(row=1, column=c).font = bold
+    # One strftime per date yields both header rows ("02-Mar", "Mon")
+    header_strs = [d.strftime("%d-%b %a").split(" ") for d in dates]
 
-    ws["B2"] = "Main/NL/ASC"
-    ws["B2"].font = bold
+    date_cells = buffered_row(1)
+    dow_cells = buffered_row(2)
+    for i, (day_str, dow_str) in zip(col_idx, header_strs):
+        date_cells[i] = (day_str, bold)
+        dow_cells[i] = (dow_str, bold)
 
-    for d, c in col_positions.items():
-        ws.cell(row=2, column=c).value = d.strftime("%a")
-        ws.cell(row=2, column=c).font = bold
+    set_cell(2, 2, "Main/NL/ASC", style=bold)
 
     row = 3
 
     def write_row(label, values, fill=None, bold_row=False):
         nonlocal row
     
-        header_cell = ws[f"B{row}"]
-        header_cell.value = label
-    
-        if bold_row:
-            header_cell.font = bold
-    
+        # Resolve the buffered row once instead of per cell
+        cells = buffered_row(row)
+
         # 🔹 NEW: apply same fill to header cell
-        if fill:
-            header_cell.fill = fill
+        cells[1] = (label, fill or (bold if bold_row else None))
     
-        for d, val in values.items():
-            cell = ws.cell(row=row, column=col_positions[d])
-            cell.value = val
-            if fill:
-                cell.fill = fill
+        # `values` is positional, aligned with `dates` / `cols`
+        for i, val in zip(col_idx, values):
+            cells[i] = (val, fill)
                 
         row += 1
 
@@ -113,316 +385,231 @@ def run_staffing_model(input_excel, output_excel):
         nonlocal row
         row += 1
 
-    computed = {}
+    # ---------------- Vectorized staffing math ----------------
+    # Every date is independent, so the whole horizon is computed as
+    # NumPy arrays at once; empty days are zero-filled here and blanked
+    # again when the report rows are written.
+    # A date is empty when any required row is blank or missing (all NaN)
+    empty = np.isnan(mat).any(axis=0)
+
+    def day_values(label):
+        return np.nan_to_num(mat[REQ_IDX[label]]).astype(np.int64)
+
+    demand = day_values("demand")
+    trainees = day_values("trainees")
+    crnas = day_values("crnas")
+    faculty = day_values("faculty")
+
+    day = compute_staffing_days(demand, trainees, crnas, faculty)
+
+    # One array per report key (struct of arrays, aligned with `dates`)
+    n = len(dates)
+    by_key = {
+        "nfp": demand,
+        "trainee": trainees,
+        "solo": day["solo_faculty"],
+        "crna": day["crna_rooms"],
+        "diff": day["difference"],
+        "1:1": np.full(n, CARDIAC_FAC),
+        "1:2": day["faculty_for_trainees"],
+        "1:3.5": day["faculty_for_crnas"],
+        "supervisory": day["supervisory"],
+        "addition_supervisory_faculty": day["addition_faculty_supervisory"],
+        "faculty_needed": day["faculty_needed"],
+        "final_faculty": day["final_faculty_required"],
+        "nl": np.full(n, NL_FAC),
+        "mor": day["mor_asc_sat"],
+        "pct_solo": np.char.add(day["percent_solo"].astype(str), "%"),
+        "faculty_sched": faculty,
+        "overage": day["overage_faculty"],
+        "crna_sched": day["scheduled_flex_crnas"],
+        "crna_demand": day["crna_demand"],
+        "crna_needed": day["crna_needed"],
+    }
 
     print("\n================ STAFFING MODEL RUN START ================\n")
 
-    for d in dates:
-        print("\n----------------------------------------------------------")
-        print(f"Date: {d}")
-
-        # ---- EMPTY INPUT HANDLING ----
-        if is_empty_day(df, d):
-            print("  ⚠ Input data is empty for this date. Output will remain blank.")
-    
-            computed[d] = {
-                "nfp": "",
-                "no_flex": "",
-                "trainee": "",
-                "solo": "",
-                "crna": "",
-                "diff": "",
-                "1:1": "",
-                "1:2": "",
-                "1:3.5": "",
-                "supervisory": "",
-                "addition_supervisory_faculty": "",
-                "faculty_needed": "",
-                "final_faculty": "",
-                "nl": "",
-                "mor": "",
-                "pct_solo": "",
-                "faculty_sched": "",
-                "overage": "",
-                "crna_sched": "",
-                "crna_demand": "",
-                "crna_needed": "",
-            }
-            continue
-
-        demand = int(df.loc["demand", d])
-        trainees = int(df.loc["trainees", d])
-        crnas = int(df.loc["crnas", d])
-        faculty = int(df.loc["faculty", d])
-
-        fixed_crnas = 5
-        cardiac_faculty = 3
-        nl_fac = 5
-
-        scheduled_flex_crnas = max(crnas, 0)
-
-        print("\nINPUTS")
-        print(f"  Rooms      : {demand}")
-        print(f"  Trainees   : {trainees}")
-        print(f"  CRNAs      : {crnas}")
-        print(f"  Faculty    : {faculty}")
-
-        # -------- Initial availability --------
-        available_rooms = demand
-        available_faculty = faculty
-
-        print("\nINITIAL AVAILABILITY")
-        print(
-            f"  Available rooms: "
-            f"{demand}"
-        )
-        print(
-            f"  Available faculty: "
-            f"{faculty}"
-        )
-
-        # -------- Trainee coverage --------
-        trainee_rooms = min(trainees, available_rooms)
-        raw_trainee_faculty = trainee_rooms / 2 - 1.5
-        faculty_for_trainees = round_1_decimal(min(
-            raw_trainee_faculty,
-            available_faculty
-        ))
-
-        prev_rooms = available_rooms
-        prev_fac = available_faculty
-
-        available_rooms -= trainee_rooms
-        available_faculty -= faculty_for_trainees
-
-        print("\nTRAINEE COVERAGE (1:2)")
-        print(f"  Trainee rooms assigned : min({trainees}, {prev_rooms}) = {trainee_rooms}")
-        print(f"  Faculty supervising    : ({trainee_rooms} / 2) - 1.5 = {faculty_for_trainees}")
-        print(f"  Rooms remaining        : {prev_rooms} - {trainee_rooms} = {available_rooms}")
-        print(
-            f"  Faculty remaining      : "
-            f"{prev_fac} - {faculty_for_trainees} = {available_faculty}"
-        )
-
-        # -------- CRNA coverage --------
-        prev_rooms = available_rooms
-        prev_fac = available_faculty
-
-        crna_rooms = min(scheduled_flex_crnas, available_rooms)
-        raw_crna_faculty = crna_rooms / 3.5
-        faculty_for_crnas = round_1_decimal(min(
-            raw_crna_faculty,
-            available_faculty
-        ))
-
-        available_rooms -= crna_rooms
-        available_faculty -= faculty_for_crnas
-
-        print("\nCRNA COVERAGE (1:3.5)")
-        print(
-            f"  CRNA rooms assigned    : "
-            f"min({scheduled_flex_crnas}, {prev_rooms}) = {crna_rooms}"
-        )
-        print(
-            f"  Faculty supervising    : "
-            f"({crna_rooms} / 3.5) = {faculty_for_crnas}"
-        )
-        print(f"  Rooms remaining        : {prev_rooms} - {crna_rooms} = {available_rooms}")
-        print(
-            f"  Faculty remaining      : "
-            f"{prev_fac} - {faculty_for_crnas} = {available_faculty}"
-        )
-
-        # -------- Solo faculty --------
-        # solo_faculty = min(available_faculty, available_rooms)
-        solo_faculty = available_rooms
-
-        print("\nSOLO FACULTY COVERAGE")
-        print(
-            f"  Solo faculty rooms     : "
-            f" {solo_faculty}"
-        )
-
-        # -------- Faculty summary --------
-        supervisory = cardiac_faculty + faculty_for_trainees + faculty_for_crnas
-        addition_faculty_supervisory = supervisory + solo_faculty
-        faculty_needed = round_half_up(supervisory + solo_faculty)
-        asc_cd_faculty = 1
-        final_faculty_required = faculty_needed + 2 + asc_cd_faculty
-        overage_faculty = faculty - final_faculty_required
-
-        mor_asc_sat = final_faculty_required - nl_fac
-
-        percent_solo = (
-            round((solo_faculty / mor_asc_sat) * 100)
-            if mor_asc_sat > 0 else 0
-        )
-
-        print("\nFACULTY SUMMARY")
-        print(
-            f"  Supervisory faculty    : "
-            f"{cardiac_faculty} + {faculty_for_trainees} + {faculty_for_crnas} = {supervisory}"
-        )
-        print(f"  Solo faculty           : {solo_faculty}")
-        print(
-            f"  Faculty covering rooms : "
-            f"{supervisory} + {solo_faculty} = {faculty_needed}"
-        )
-        # print(
-        #     f"  Final faculty required : "
-        #     f"{faculty_needed} + 2 (CD + NL) = {final_faculty_required}"
-        # )
-        print(
-            f"  Final faculty required : "
-            f"{faculty_needed} + 2 (CD + NL) + {asc_cd_faculty} (ASC CD) = {final_faculty_required}"
-        )
-
-        print(
-            f"  Faculty scheduled      : "
-            f"{faculty}"
-        )
-        print(
-            f"  Overage of faculty     : "
-            f"{faculty} - {final_faculty_required} = {overage_faculty}"
-        )
-        print(
-            f"  MOR/ASC/Sat faculty    : "
-            f"{final_faculty_required} - {nl_fac} = {mor_asc_sat}"
-        )
-        print(
-            f"  % Solo                 : "
-            f"({solo_faculty} / {mor_asc_sat}) * 100 = {percent_solo}%"
-        )
-
-        # -------- CRNA summary --------
-        crna_demand = demand - trainee_rooms - solo_faculty
-        crna_needed = crna_demand - scheduled_flex_crnas
-
-        print("\nCRNA SUMMARY")
-        print(
-            f"  CRNA demand            : "
-            f"{demand} - {trainee_rooms} - {solo_faculty} = {crna_demand}"
-        )
-        print(
-            f"  CRNAs scheduled (flex) : "
-            f"{crnas} = {scheduled_flex_crnas}"
-        )
-        print(
-            f"  CRNAs needed           : "
-            f"{crna_demand} - {scheduled_flex_crnas} = {crna_needed}"
-        )
-
-        computed[d] = {
-            "nfp": demand,
-            "trainee": trainees,
-            "solo": solo_faculty,
-            "crna": crna_rooms,
-            "diff": demand - trainees - crna_rooms,
-            "1:1": cardiac_faculty,
-            "1:2": faculty_for_trainees,
-            "1:3.5": faculty_for_crnas,
-            "supervisory": supervisory,
-            "addition_supervisory_faculty" : addition_faculty_supervisory,
-            "faculty_needed": faculty_needed,
-            "final_faculty": final_faculty_required,
-            "nl": nl_fac,
-            "mor": mor_asc_sat,
-            "pct_solo": f"{percent_solo}%",
-            "faculty_sched": faculty,
-            "overage": faculty - final_faculty_required,
-            "crna_sched": scheduled_flex_crnas,
-            "crna_demand": crna_demand,
-            "crna_needed": crna_needed,
-        }
+    # Per-date breakdown is only formatted when asked for (--verbose)
+    if verbose:
+        for i, d in enumerate(dates):
+            print("\n----------------------------------------------------------")
+            print(f"Date: {d}")
+
+            # ---- EMPTY INPUT HANDLING ----
+            if empty[i]:
+                print("  ⚠ Input data is empty for this date. Output will remain blank.")
+                continue
+
+            c = {k: v[i] for k, v in by_key.items()}
+
+            print("\nINPUTS")
+            print(f"  Rooms      : {c['nfp']}")
+            print(f"  Trainees   : {c['trainee']}")
+            print(f"  CRNAs      : {crnas[i]}")
+            print(f"  Faculty    : {c['faculty_sched']}")
+
+            print("\nINITIAL AVAILABILITY")
+            print(
+                f"  Available rooms: "
+                f"{c['nfp']}"
+            )
+            print(
+                f"  Available faculty: "
+                f"{c['faculty_sched']}"
+            )
+
+            print("\nTRAINEE COVERAGE (1:2)")
+            print(f"  Trainee rooms assigned : min({c['trainee']}, {c['nfp']}) = {day['trainee_rooms'][i]}")
+            print(f"  Faculty supervising    : ({day['trainee_rooms'][i]} / 2) - 1.5 = {c['1:2']}")
+            print(f"  Rooms remaining        : {c['nfp']} - {day['trainee_rooms'][i]} = {day['rooms_after_trainees'][i]}")
+            print(
+                f"  Faculty remaining      : "
+                f"{c['faculty_sched']} - {c['1:2']} = {day['faculty_after_trainees'][i]}"
+            )
+
+            print("\nCRNA COVERAGE (1:3.5)")
+            print(
+                f"  CRNA rooms assigned    : "
+                f"min({c['crna_sched']}, {day['rooms_after_trainees'][i]}) = {c['crna']}"
+            )
+            print(
+                f"  Faculty supervising    : "
+                f"({c['crna']} / 3.5) = {c['1:3.5']}"
+            )
+            print(f"  Rooms remaining        : {day['rooms_after_trainees'][i]} - {c['crna']} = {day['rooms_after_crnas'][i]}")
+            print(
+                f"  Faculty remaining      : "
+                f"{day['faculty_after_trainees'][i]} - {c['1:3.5']} = {day['faculty_after_crnas'][i]}"
+            )
+
+            print("\nSOLO FACULTY COVERAGE")
+            print(
+                f"  Solo faculty rooms     : "
+                f" {c['solo']}"
+            )
+
+            print("\nFACULTY SUMMARY")
+            print(
+                f"  Supervisory faculty    : "
+                f"{CARDIAC_FAC} + {c['1:2']} + {c['1:3.5']} = {c['supervisory']}"
+            )
+            print(f"  Solo faculty           : {c['solo']}")
+            print(
+                f"  Faculty covering rooms : "
+                f"{c['supervisory']} + {c['solo']} = {c['faculty_needed']}"
+            )
+            # print(
+            #     f"  Final faculty required : "
+            #     f"{faculty_needed} + 2 (CD + NL) = {final_faculty_required}"
+            # )
+            print(
+                f"  Final faculty required : "
+                f"{c['faculty_needed']} + 2 (CD + NL) + {ASC_CD_FAC} (ASC CD) = {c['final_faculty']}"
+            )
+
+            print(
+                f"  Faculty scheduled      : "
+                f"{c['faculty_sched']}"
+            )
+            print(
+                f"  Overage of faculty     : "
+                f"{c['faculty_sched']} - {c['final_faculty']} = {c['overage']}"
+            )
+            print(
+                f"  MOR/ASC/Sat faculty    : "
+                f"{c['final_faculty']} - {NL_FAC} = {c['mor']}"
+            )
+            print(
+                f"  % Solo                 : "
+                f"({c['solo']} / {c['mor']}) * 100 = {day['percent_solo'][i]}%"
+            )
+
+            print("\nCRNA SUMMARY")
+            print(
+                f"  CRNA demand            : "
+                f"{c['nfp']} - {day['trainee_rooms'][i]} - {c['solo']} = {c['crna_demand']}"
+            )
+            print(
+                f"  CRNAs scheduled (flex) : "
+                f"{crnas[i]} = {c['crna_sched']}"
+            )
+            print(
+                f"  CRNAs needed           : "
+                f"{c['crna_demand']} - {c['crna_sched']} = {c['crna_needed']}"
+            )
 
     print("\n================ STAFFING MODEL RUN END ==================\n")
 
-    # -------- Excel output (unchanged) --------
-    write_row("Main/NL/ASC Demand", {d: computed[d]["nfp"] for d in dates})
-    write_row("Main/NL/ASC Trainee", {d: computed[d]["trainee"] for d in dates})
-    write_row("Solo Faculty", {d: computed[d]["solo"] for d in dates}, fill=yellow)
-    write_row("Main/NL/ASC CRNA", {d: df.loc["crnas", d] for d in dates})
-    write_row("difference", {d: computed[d]["diff"] for d in dates}, fill=blue)
+    # -------- Excel output --------
+    def maybe_blank(arr):
+        # Empty dates are written as blank cells
+        return np.where(empty, "", arr.astype(object)).tolist()
+
+    def cells(key):
+        return maybe_blank(by_key[key])
+
+    fixed_one = maybe_blank(np.ones(n, dtype=np.int64))
+
+    write_row("Main/NL/ASC Demand", cells("nfp"))
+    write_row("Main/NL/ASC Trainee", cells("trainee"))
+    write_row("Solo Faculty", cells("solo"), fill=yellow)
+    write_row("Main/NL/ASC CRNA", list(rows["crnas"]))
+    write_row("difference", cells("diff"), fill=blue)
 
     blank()
-    ws[f"B{row}"] = "Room ratio"
-    ws[f"B{row}"].font = bold
+    set_cell(row, 2, "Room ratio", style=bold)
     row += 1
 
-    write_row("1:1", {d: computed[d]["1:1"] for d in dates})
-    write_row("1:2", {d: computed[d]["1:2"] for d in dates})
-    write_row("1:3.5", {d: computed[d]["1:3.5"] for d in dates})
+    write_row("1:1", cells("1:1"))
+    write_row("1:2", cells("1:2"))
+    write_row("1:3.5", cells("1:3.5"))
 
     blank()
-    write_row("Supervisory Faculty needed", {d: computed[d]["supervisory"] for d in dates})
-    write_row("Solo Faculty", {d: computed[d]["solo"] for d in dates})
-    write_row(
-        "",
-        {
-            d: computed[d]["addition_supervisory_faculty"]
-            if isinstance(computed[d]["addition_supervisory_faculty"], (int, float))
-            else ""
-            for d in dates
-        },
-        bold_row=True
-    )
+    write_row("Supervisory Faculty needed", cells("supervisory"))
+    write_row("Solo Faculty", cells("solo"))
+    write_row("", cells("addition_supervisory_faculty"), bold_row=True)
     
     blank()
-    write_row(
-        "Faculty needed",
-        {
-            d: computed[d]["faculty_needed"]
-            if isinstance(computed[d]["faculty_needed"], (int, float))
-            else ""
-            for d in dates
-        },
-        bold_row=True
-    )
+    write_row("Faculty needed", cells("faculty_needed"), bold_row=True)
 
 
-    # write_row("+ CD (MOR)", {d: 1 for d in dates})
-    # write_row("+ NL OR Block", {d: 1 for d in dates})
-    write_row(
-        "+ CD (MOR)",
-        {d: 1 if computed[d]["final_faculty"] != "" else "" for d in dates}
-    )
-    
-    write_row(
-        "+ NL OR Block",
-        {d: 1 if computed[d]["final_faculty"] != "" else "" for d in dates}
-    )
+    # write_row("+ CD (MOR)", [1] * len(dates))
+    # write_row("+ NL OR Block", [1] * len(dates))
+    write_row("+ CD (MOR)", fixed_one)
+    write_row("+ NL OR Block", fixed_one)
+    write_row("+ ASC CD", fixed_one)
 
-    write_row("+ ASC CD", {d: 1 if computed[d]["final_faculty"] != "" else "" for d in dates})
-
-    write_row("", {d: computed[d]["final_faculty"] for d in dates})
+    write_row("", cells("final_faculty"))
 
     blank()
-    write_row("NL fac", {d: computed[d]["nl"] for d in dates}, bold_row=True)
-    write_row("MOR/ASC/Sat", {d: computed[d]["mor"] for d in dates}, bold_row=True)
+    write_row("NL fac", cells("nl"), bold_row=True)
+    write_row("MOR/ASC/Sat", cells("mor"), bold_row=True)
 
     blank()
-    write_row("% solo", {d: computed[d]["pct_solo"] for d in dates}, fill=green)
+    write_row("% solo", cells("pct_solo"), fill=green)
 
     blank()
-    write_row("Faculty Scheduled", {d: computed[d]["faculty_sched"] for d in dates})
-    write_row("Expec. Solo Faculty", {d: computed[d]["solo"] for d in dates})
-    write_row("Overage of Faculty:", {d: computed[d]["overage"] for d in dates}, fill=blue)
+    write_row("Faculty Scheduled", cells("faculty_sched"))
+    write_row("Expec. Solo Faculty", cells("solo"))
+    write_row("Overage of Faculty:", cells("overage"), fill=blue)
 
     blank()
-    write_row("CRNAs Scheduled:", {d: computed[d]["crna_sched"] for d in dates})
-    write_row("CRNA Demand:", {d: computed[d]["crna_demand"] for d in dates})
-    write_row("CRNAs needed:", {d: computed[d]["crna_needed"] for d in dates}, fill=yellow)
-
-    for c in range(2, ws.max_column + 1):
-        ws.column_dimensions[get_column_letter(c)].width = 16
+    write_row("CRNAs Scheduled:", cells("crna_sched"))
+    write_row("CRNA Demand:", cells("crna_demand"))
+    write_row("CRNAs needed:", cells("crna_needed"), fill=yellow)
 
-    out_wb.save(output_excel)
+    write_report_xlsx(output_excel, rows_buffer, max_col, used_cols=[2] + cols)
     print(f"Final formatted staffing report written to: {output_excel}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True, help="Input Excel file")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log the per-date staffing breakdown",
+    )
     args = parser.parse_args()
 
     output_file = args.input.replace(".xlsx", "_output.xlsx")
@@ -436,6 +623,6 @@ if __name__ == "__main__":
     print(f"Output file: {output_file}")
     print(f"Log file   : {log_file}")
 
-    run_staffing_model(args.input, output_file)
+    run_staffing_model(args.input, output_file, verbose=args.verbose)
 
     print(f"Staffing model completed at {datetime.now()}")
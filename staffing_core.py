@@ -0,0 +1,245 @@
+import math
+from functools import lru_cache
+
+
+# ---------------------------------------------------------
+# Shared staffing steps
+# ---------------------------------------------------------
+# staffing_model.py and staffing_model_excel.py differ in their
+# parameters and output columns, but both run the same assignment steps
+# (trainees, then CRNAs, supervision, then solo faculty). Those steps
+# live here once: staffing_arrays for all scenarios at a time, and
+# staffing_steps for a single scenario. Both return their results in
+# STEP_KEYS order.
+
+STEP_KEYS = (
+    "crnas_available_for_rooms",
+    "faculty_available_for_coverage",
+    "trainee_rooms",
+    "crna_rooms",
+    "solo_rooms",
+    "faculty_for_trainees",
+    "faculty_for_crnas",
+    "faculty_left",
+    "max_rooms_coverable",
+    "rooms_left",
+)
+
+# Largest ratio denominator for the integer form of ceil_div_ratio; keeps
+# rooms * den far from the int64 limit of the vectorized path
+MAX_EXACT_DEN = 1024
+
+
+def ceil_div(a, b):
+    """ceil(a / b) for ints (or int arrays) without float division."""
+    return -(-a // b)
+
+
+def ceil_div_ratio(rooms, ratio):
+    """
+    ceil(rooms / ratio) for int rooms (or int64 arrays) and an int or
+    float ratio.
+
+    A ratio that is a short binary fraction is split into num / den
+    (e.g. 3.5 -> 7 / 2), so rooms / ratio == rooms * den / num is done
+    exactly in integers. Any other ratio (e.g. 3.3, whose exact
+    denominator is 2**51) falls back to the float ceil the model always
+    used, math.ceil(rooms / ratio), instead of overflowing rooms * den.
+    """
+    num, den = ratio.as_integer_ratio()
+    if den <= MAX_EXACT_DEN:
+        return ceil_div(rooms * den, num)
+
+    rooms_per_faculty = rooms / ratio
+    if isinstance(rooms_per_faculty, float):
+        return math.ceil(rooms_per_faculty)
+
+    import numpy as np
+
+    return np.ceil(rooms_per_faculty).astype(np.int64)
+
+
+def is_closed(total_rooms, trainees):
+    """
+    Scenarios (ints or arrays) whose room assignment is a no-op.
+
+    With no rooms and a non-negative trainee count nothing is assigned,
+    no supervision is needed and all available faculty stays as buffer.
+    (A negative trainee count still "assigns" rooms, like the full
+    steps do, so those scenarios are not short-circuited.)
+    """
+    return (total_rooms == 0) & (trainees >= 0)
+
+
+@lru_cache(maxsize=None, typed=True)
+def staffing_steps(
+    total_rooms, trainees, crnas, faculty,
+    trainee_ratio, crna_ratio, fixed_crnas, fixed_faculty,
+):
+    """
+    staffing_arrays for one scenario, on plain ints.
+
+    Returns a tuple in STEP_KEYS order. Pure function of its arguments,
+    so repeated scenarios (sweep grids, duplicated rows) are served from
+    the cache. The cache is typed: 10 and 10.0 (or np.int64(10)) are
+    equal keys but give differently typed results.
+    """
+    # max()/min() are spelled out as plain comparisons below: in CPython
+    # that avoids a builtin call per step and is several times faster
+    # for two ints.
+
+    # Fixed staff
+    faculty_available_for_coverage = faculty - fixed_faculty
+    if faculty_available_for_coverage < 0:
+        faculty_available_for_coverage = 0
+
+    crnas_available_for_rooms = crnas - fixed_crnas
+    if crnas_available_for_rooms < 0:
+        crnas_available_for_rooms = 0
+
+    if is_closed(total_rooms, trainees):
+        return (
+            crnas_available_for_rooms,
+            faculty_available_for_coverage,
+            0, 0, 0, 0, 0,
+            faculty_available_for_coverage,
+            0, 0,
+        )
+
+    # Assign trainees, then CRNAs
+    trainee_rooms = trainees if trainees < total_rooms else total_rooms
+    rooms_left = total_rooms - trainee_rooms
+
+    crna_rooms = (
+        crnas_available_for_rooms
+        if crnas_available_for_rooms < rooms_left else rooms_left
+    )
+    rooms_left -= crna_rooms
+
+    # Supervision (none when the room count is zero or, from negative
+    # inputs, below zero)
+    faculty_for_trainees = (
+        ceil_div_ratio(trainee_rooms, trainee_ratio) if trainee_rooms > 0 else 0
+    )
+    faculty_for_crnas = (
+        ceil_div_ratio(crna_rooms, crna_ratio) if crna_rooms > 0 else 0
+    )
+
+    faculty_left = faculty_available_for_coverage - (
+        faculty_for_trainees + faculty_for_crnas
+    )
+    if faculty_left < 0:
+        faculty_left = 0
+
+    # Solo faculty rooms
+    solo_rooms = faculty_left if faculty_left < rooms_left else rooms_left
+    faculty_left -= solo_rooms
+    rooms_left -= solo_rooms
+
+    return (
+        crnas_available_for_rooms,
+        faculty_available_for_coverage,
+        trainee_rooms,
+        crna_rooms,
+        solo_rooms,
+        faculty_for_trainees,
+        faculty_for_crnas,
+        faculty_left,
+        trainee_rooms + crna_rooms + solo_rooms,
+        rooms_left,
+    )
+
+
+def _assign_rooms(
+    total_rooms, trainees, crnas_available_for_rooms,
+    faculty_available_for_coverage, trainee_ratio, crna_ratio,
+):
+    """The room assignment steps of staffing_arrays (after fixed staff)."""
+    import numpy as np
+
+    # Assign trainees, then CRNAs
+    trainee_rooms = np.minimum(trainees, total_rooms)
+    rooms_left = total_rooms - trainee_rooms
+
+    crna_rooms = np.minimum(crnas_available_for_rooms, rooms_left)
+    rooms_left = rooms_left - crna_rooms
+
+    # Supervision (none needed when no rooms are assigned, even if
+    # negative input counts make the room count negative)
+    faculty_for_trainees = ceil_div_ratio(np.maximum(trainee_rooms, 0), trainee_ratio)
+    faculty_for_crnas = ceil_div_ratio(np.maximum(crna_rooms, 0), crna_ratio)
+
+    faculty_left = np.maximum(
+        faculty_available_for_coverage - (faculty_for_trainees + faculty_for_crnas),
+        0,
+    )
+
+    # Solo faculty rooms
+    solo_rooms = np.minimum(faculty_left, rooms_left)
+    faculty_left = faculty_left - solo_rooms
+    rooms_left = rooms_left - solo_rooms
+
+    return {
+        "trainee_rooms": trainee_rooms,
+        "crna_rooms": crna_rooms,
+        "solo_rooms": solo_rooms,
+        "faculty_for_trainees": faculty_for_trainees,
+        "faculty_for_crnas": faculty_for_crnas,
+        "faculty_left": faculty_left,
+        "max_rooms_coverable": trainee_rooms + crna_rooms + solo_rooms,
+        "rooms_left": rooms_left,
+    }
+
+
+def staffing_arrays(
+    total_rooms, trainees, crnas, faculty,
+    trainee_ratio, crna_ratio, fixed_crnas, fixed_faculty,
+):
+    """
+    Staffing steps for all scenarios at once.
+
+    The four counts are int64 arrays of the same length; fixed_crnas and
+    fixed_faculty are the buffers taken out before any room is assigned.
+    Returns a dict of int64 arrays keyed by STEP_KEYS.
+    """
+    # numpy is only imported by the array paths, so the scalar
+    # staffing_steps (compute_only) needs nothing outside the stdlib
+    import numpy as np
+
+    # Fixed staff
+    faculty_available_for_coverage = np.maximum(faculty - fixed_faculty, 0)
+    crnas_available_for_rooms = np.maximum(crnas - fixed_crnas, 0)
+
+    result = {
+        "crnas_available_for_rooms": crnas_available_for_rooms,
+        "faculty_available_for_coverage": faculty_available_for_coverage,
+    }
+
+    active = ~is_closed(total_rooms, trainees)
+    if active.all():
+        result.update(_assign_rooms(
+            total_rooms, trainees, crnas_available_for_rooms,
+            faculty_available_for_coverage, trainee_ratio, crna_ratio,
+        ))
+        return result
+
+    # Closed days (see is_closed) assign nothing and keep all available
+    # faculty as buffer, so only the open rows go through the steps and
+    # their results are scattered back into full-length arrays
+    steps = _assign_rooms(
+        total_rooms[active],
+        trainees[active],
+        crnas_available_for_rooms[active],
+        faculty_available_for_coverage[active],
+        trainee_ratio,
+        crna_ratio,
+    )
+    for key, values in steps.items():
+        if key == "faculty_left":
+            out = faculty_available_for_coverage.copy()
+        else:
+            out = np.zeros(len(total_rooms), dtype=np.int64)
+        out[active] = values
+        result[key] = out
+
+    return result
@@ -1,15 +1,15 @@
-import math
 import argparse
 import sys
-from dataclasses import dataclass, asdict
-import pandas as pd
+from dataclasses import dataclass, fields
+
+from staffing_core import staffing_arrays, staffing_steps
 
 
 # ---------------------------------------------------------
 # Parameters
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Parameters:
     trainee_supervision_ratio: int = 2   # 1 faculty per 2 trainee rooms
     crna_supervision_ratio: int = 4      # 1 faculty per 4 CRNA rooms
@@ -23,7 +23,7 @@ class Parameters:
 # Scenario input
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioInput:
     name: str
     total_rooms: int
@@ -36,7 +36,7 @@ class ScenarioInput:
 # Scenario output
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioResult:
     name: str
     total_rooms: int
@@ -62,77 +62,63 @@ class ScenarioResult:
     rooms_left_to_cover: int
 
 
+# Output column order, computed once
+_OUT_COLS = [f.name for f in fields(ScenarioResult)]
+
+# ScenarioResult fields filled from staffing_core.staffing_arrays results
+_ARRAY_COLS = {
+    "crnas_available_for_rooms": "crnas_available_for_rooms",
+    "faculty_available_for_coverage": "faculty_available_for_coverage",
+    "rooms_covered_by_trainees": "trainee_rooms",
+    "rooms_covered_by_crnas": "crna_rooms",
+    "rooms_covered_by_faculty": "solo_rooms",
+    "faculty_used_for_trainee_supervision": "faculty_for_trainees",
+    "faculty_used_for_crna_supervision": "faculty_for_crnas",
+    "faculty_buffer": "faculty_left",
+    "max_rooms_coverable": "max_rooms_coverable",
+    "rooms_left_to_cover": "rooms_left",
+}
+
+
 # ---------------------------------------------------------
 # Core calculation
 # ---------------------------------------------------------
 
 def compute_staffing(scenario: ScenarioInput, params: Parameters):
 
-    total_rooms = scenario.total_rooms
-
-    crnas_total = scenario.crnas_available
-    faculty_total = scenario.faculty_available
-
-    crnas_fixed_buffer = params.crnas_location_buffer
-    faculty_main_or_buffer = params.faculty_location_buffer
-    faculty_board_runner = params.board_runner_faculty
-
-    crnas_available_for_rooms = max(
-        crnas_total - crnas_fixed_buffer, 0
-    )
-
-    faculty_available_for_coverage = max(
-        faculty_total - faculty_main_or_buffer - faculty_board_runner, 0
-    )
-
-    # Step 1: Trainee rooms
-    trainee_rooms = min(scenario.trainees_available, total_rooms)
-    rooms_left = total_rooms - trainee_rooms
-
-    # Step 2: CRNA rooms
-    crna_rooms = min(crnas_available_for_rooms, rooms_left)
-    rooms_left -= crna_rooms
-
-    # Step 3: Supervision
-    faculty_for_trainees = (
-        math.ceil(trainee_rooms / params.trainee_supervision_ratio)
-        if trainee_rooms > 0 else 0
-    )
-
-    faculty_for_crnas = (
-        math.ceil(crna_rooms / params.crna_supervision_ratio)
-        if crna_rooms > 0 else 0
+    (
+        crnas_available_for_rooms,
+        faculty_available_for_coverage,
+        trainee_rooms,
+        crna_rooms,
+        solo_rooms,
+        faculty_for_trainees,
+        faculty_for_crnas,
+        faculty_buffer,
+        max_rooms_coverable,
+        rooms_left_to_cover,
+    ) = staffing_steps(
+        scenario.total_rooms,
+        scenario.trainees_available,
+        scenario.crnas_available,
+        scenario.faculty_available,
+        params.trainee_supervision_ratio,
+        params.crna_supervision_ratio,
+        params.crnas_location_buffer,
+        params.faculty_location_buffer + params.board_runner_faculty,
     )
 
-    faculty_left = faculty_available_for_coverage - (
-        faculty_for_trainees + faculty_for_crnas
-    )
-    faculty_left = max(faculty_left, 0)
-
-    # Step 4: Solo faculty rooms
-    solo_rooms = min(faculty_left, rooms_left)
-    faculty_left -= solo_rooms
-    rooms_left -= solo_rooms
-
-    faculty_buffer = faculty_left
-
-    max_rooms_coverable = (
-        trainee_rooms + crna_rooms + solo_rooms
-    )
-
-    rooms_left_to_cover = total_rooms - max_rooms_coverable
-
     return ScenarioResult(
         name=scenario.name,
-        total_rooms=total_rooms,
+        total_rooms=scenario.total_rooms,
 
-        crnas_total=crnas_total,
-        crnas_fixed_buffer=crnas_fixed_buffer,
+        crnas_total=scenario.crnas_available,
+        crnas_fixed_buffer=params.crnas_location_buffer,
         crnas_available_for_rooms=crnas_available_for_rooms,
 
-        faculty_total=faculty_total,
-        faculty_main_or_buffer=faculty_main_or_buffer,
-        faculty_board_runner=faculty_board_runner,
+        faculty_total=scenario.faculty_available,
+        faculty_main_or_buffer=params.faculty_location_buffer,
+        faculty_board_runner=params.board_runner_faculty,
         faculty_available_for_coverage=faculty_available_for_coverage,
 
         rooms_covered_by_trainees=trainee_rooms,
@@ -148,16 +134,64 @@ def compute_staffing(scenario: ScenarioInput, params: Parameters):
     )
 
 
+def compute_only(total_rooms, trainees, crnas, faculty, params=None):
+    """
+    Single-scenario entry point for library use: plain ints in,
+    ScenarioResult out. Needs no pandas.
+    """
+    return compute_staffing(
+        ScenarioInput(
+            name="",
+            total_rooms=total_rooms,
+            trainees_available=trainees,
+            crnas_available=crnas,
+            faculty_available=faculty,
+        ),
+        params or Parameters(),
+    )
+
+
 # ---------------------------------------------------------
 # Run scenarios
 # ---------------------------------------------------------
 
 def run_scenarios(scenarios, params):
-    rows = []
-    for sc in scenarios:
-        res = compute_staffing(sc, params)
-        rows.append(asdict(res))
-    return pd.DataFrame(rows)
+    """
+    Same results as compute_staffing for every scenario, evaluated at
+    once by the vectorized kernel shared with staffing_model_excel.py.
+    """
+    # Imported here so that importing the module (e.g. for
+    # compute_staffing / compute_only) needs neither numpy nor pandas
+    import numpy as np
+    import pandas as pd
+
+    n = len(scenarios)
+
+    total_rooms = np.fromiter((sc.total_rooms for sc in scenarios), np.int64, n)
+    trainees = np.fromiter((sc.trainees_available for sc in scenarios), np.int64, n)
+    crnas = np.fromiter((sc.crnas_available for sc in scenarios), np.int64, n)
+    faculty = np.fromiter((sc.faculty_available for sc in scenarios), np.int64, n)
+
+    r = staffing_arrays(
+        total_rooms, trainees, crnas, faculty,
+        params.trainee_supervision_ratio,
+        params.crna_supervision_ratio,
+        params.crnas_location_buffer,
+        params.faculty_location_buffer + params.board_runner_faculty,
+    )
+
+    columns = {
+        "name": [sc.name for sc in scenarios],
+        "total_rooms": total_rooms,
+        "crnas_total": crnas,
+        "crnas_fixed_buffer": np.full(n, params.crnas_location_buffer, dtype=np.int64),
+        "faculty_total": faculty,
+        "faculty_main_or_buffer": np.full(n, params.faculty_location_buffer, dtype=np.int64),
+        "faculty_board_runner": np.full(n, params.board_runner_faculty, dtype=np.int64),
+    }
+    columns.update((col, r[key]) for col, key in _ARRAY_COLS.items())
+
+    return pd.DataFrame({c: columns[c] for c in _OUT_COLS}, copy=False)
 
 
 # ---------------------------------------------------------
@@ -231,6 +265,9 @@ if __name__ == "__main__":
     print(df)
 
     output_file = "staffing_model_output.xlsx"
-    df.to_excel(output_file, index=False)
+
+    # Plain data sheet, so the faster xlsxwriter engine is enough.
+    # (constant_memory is not usable here: to_excel writes column by column)
+    df.to_excel(output_file, index=False, engine="xlsxwriter")
 
     print(f"\nResults saved to {output_file}")
@@ -1,16 +1,19 @@
-import math
 import argparse
+import csv
+import glob
 import sys
-from dataclasses import dataclass, asdict
-import pandas as pd
+from dataclasses import dataclass
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from staffing_core import ceil_div, staffing_arrays, staffing_steps
 
 
 # ---------------------------------------------------------
 # Parameters (aligned with Archit's file)
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Parameters:
     trainee_supervision_ratio: float = 2.0      # 1 faculty per 2 trainees
     crna_supervision_ratio: float = 3.5         # 1 faculty per 3.5 CRNAs
@@ -25,7 +28,7 @@ class Parameters:
 # Scenario input
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioInput:
     name: str
     total_rooms: int
@@ -38,7 +41,7 @@ class ScenarioInput:
 # Scenario output
 # ---------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScenarioResult:
     name: str
     total_rooms: int
@@ -71,6 +74,11 @@ class ScenarioResult:
 
 def compute_staffing(scenario: ScenarioInput, params: Parameters):
 
+    # Fields read more than once below are bound to locals
+    total_rooms = scenario.total_rooms
+    crnas_available = scenario.crnas_available
+    fixed_crnas = params.fixed_crnas
+
     # -------------------------
     # Fixed staff
     # -------------------------
@@ -80,50 +88,30 @@ def compute_staffing(scenario: ScenarioInput, params: Parameters):
         + params.fixed_faculty_nl_or
     )
 
-    faculty_available_for_coverage = max(
-        scenario.faculty_available - fixed_faculty_total, 0
-    )
-
-    crnas_available_for_rooms = max(
-        scenario.crnas_available - params.fixed_crnas, 0
-    )
-
-    total_rooms = scenario.total_rooms
-
-    # -------------------------
-    # Assign trainees
-    # -------------------------
-    trainee_rooms = min(scenario.trainees_available, total_rooms)
-    rooms_left = total_rooms - trainee_rooms
-
-    # -------------------------
-    # Assign CRNAs
-    # -------------------------
-    crna_rooms = min(crnas_available_for_rooms, rooms_left)
-    rooms_left -= crna_rooms
-
     # -------------------------
-    # Supervision
+    # Trainees, CRNAs, supervision, solo faculty (shared steps)
     # -------------------------
-    faculty_for_trainees = math.ceil(
-        trainee_rooms / params.trainee_supervision_ratio
-    ) if trainee_rooms > 0 else 0
-
-    faculty_for_crnas = math.ceil(
-        crna_rooms / params.crna_supervision_ratio
-    ) if crna_rooms > 0 else 0
-
-    faculty_left = faculty_available_for_coverage - (
-        faculty_for_trainees + faculty_for_crnas
+    (
+        crnas_available_for_rooms,
+        faculty_available_for_coverage,
+        trainee_rooms,
+        crna_rooms,
+        solo_faculty_rooms,
+        faculty_for_trainees,
+        faculty_for_crnas,
+        faculty_left,
+        max_rooms_coverable,
+        rooms_left,
+    ) = staffing_steps(
+        total_rooms,
+        scenario.trainees_available,
+        crnas_available,
+        scenario.faculty_available,
+        params.trainee_supervision_ratio,
+        params.crna_supervision_ratio,
+        fixed_crnas,
+        fixed_faculty_total,
     )
-    faculty_left = max(faculty_left, 0)
-
-    # -------------------------
-    # Solo faculty rooms
-    # -------------------------
-    solo_faculty_rooms = min(faculty_left, rooms_left)
-    faculty_left -= solo_faculty_rooms
-    rooms_left -= solo_faculty_rooms
 
     # -------------------------
     # CRNA demand (Archit logic)
@@ -132,26 +120,19 @@ def compute_staffing(scenario: ScenarioInput, params: Parameters):
         total_rooms
         - trainee_rooms
         - solo_faculty_rooms
-        - params.fixed_crnas,
+        - fixed_crnas,
         0
     )
 
-    crnas_shortage = max(crna_demand - scenario.crnas_available, 0)
-
-    # -------------------------
-    # Final
-    # -------------------------
-    max_rooms_coverable = (
-        trainee_rooms + crna_rooms + solo_faculty_rooms
-    )
+    crnas_shortage = max(crna_demand - crnas_available, 0)
 
     return ScenarioResult(
         name=scenario.name,
         total_rooms=total_rooms,
 
         trainees_used=trainee_rooms,
-        crnas_total=scenario.crnas_available,
-        crnas_fixed=params.fixed_crnas,
+        crnas_total=crnas_available,
+        crnas_fixed=fixed_crnas,
         crnas_available_for_rooms=crnas_available_for_rooms,
 
         faculty_total=scenario.faculty_available,
@@ -172,10 +153,271 @@ def compute_staffing(scenario: ScenarioInput, params: Parameters):
     )
 
 
+def compute_only(total_rooms, trainees, crnas, faculty, params=None):
+    """
+    Single-scenario entry point for library use: plain ints in,
+    ScenarioResult out. Needs none of pandas, openpyxl or xlsxwriter.
+    """
+    return compute_staffing(
+        ScenarioInput(
+            name="",
+            total_rooms=total_rooms,
+            trainees_available=trainees,
+            crnas_available=crnas,
+            faculty_available=faculty,
+        ),
+        params or Parameters(),
+    )
+
+
+# ---------------------------------------------------------
+# Batch calculation (vectorized)
+# ---------------------------------------------------------
+
+def compute_arrays(columns, params):
+    """
+    Same logic as compute_staffing, evaluated for all scenarios at once
+    with NumPy arrays. columns maps the INPUT_COLUMNS names to sequences
+    (a dict of arrays or a DataFrame). Returns the ScenarioResult columns
+    in field order: names as a list, everything else as int64 arrays.
+    """
+    import numpy as np
+
+    names = list(columns["scenario_name"])
+    n = len(names)
+
+    total_rooms = np.asarray(columns["total_rooms"], dtype=np.int64)
+    trainees = np.asarray(columns["trainees"], dtype=np.int64)
+    crnas = np.asarray(columns["crnas"], dtype=np.int64)
+    faculty = np.asarray(columns["faculty"], dtype=np.int64)
+
+    fixed_faculty_total = (
+        params.fixed_faculty_cardiac
+        + params.fixed_faculty_main_or
+        + params.fixed_faculty_nl_or
+    )
+
+    r = staffing_arrays(
+        total_rooms, trainees, crnas, faculty,
+        params.trainee_supervision_ratio,
+        params.crna_supervision_ratio,
+        params.fixed_crnas,
+        fixed_faculty_total,
+    )
+
+    # CRNA demand (Archit logic)
+    crna_demand = np.maximum(
+        total_rooms - r["trainee_rooms"] - r["solo_rooms"] - params.fixed_crnas,
+        0,
+    )
+    crnas_shortage = np.maximum(crna_demand - crnas, 0)
+
+    return {
+        "name": names,
+        "total_rooms": total_rooms,
+
+        "trainees_used": r["trainee_rooms"],
+        "crnas_total": crnas,
+        "crnas_fixed": np.full(n, params.fixed_crnas, dtype=np.int64),
+        "crnas_available_for_rooms": r["crnas_available_for_rooms"],
+
+        "faculty_total": faculty,
+        "faculty_fixed_total": np.full(n, fixed_faculty_total, dtype=np.int64),
+        "faculty_available_for_coverage": r["faculty_available_for_coverage"],
+
+        "faculty_used_for_trainee_supervision": r["faculty_for_trainees"],
+        "faculty_used_for_crna_supervision": r["faculty_for_crnas"],
+
+        "solo_faculty_rooms": r["solo_rooms"],
+
+        "crna_demand": crna_demand,
+        "crnas_shortage": crnas_shortage,
+
+        "faculty_buffer": r["faculty_left"],
+        "max_rooms_coverable": r["max_rooms_coverable"],
+        "rooms_left_to_cover": r["rooms_left"],
+    }
+
+
+def run_scenarios_from_columns(columns, params):
+    """compute_arrays as a DataFrame, for callers that want pandas."""
+    # numpy, pandas, openpyxl and xlsxwriter are imported where they are
+    # used, so compute_staffing / compute_only need only the stdlib
+    import pandas as pd
+
+    return pd.DataFrame(compute_arrays(columns, params), copy=False)
+
+
 def run_scenarios(scenarios, params):
-    return pd.DataFrame(
-        [asdict(compute_staffing(sc, params)) for sc in scenarios]
+    """List-of-ScenarioInput wrapper around run_scenarios_from_columns."""
+    return run_scenarios_from_columns(
+        {
+            "scenario_name": [sc.name for sc in scenarios],
+            "total_rooms": [sc.total_rooms for sc in scenarios],
+            "trainees": [sc.trainees_available for sc in scenarios],
+            "crnas": [sc.crnas_available for sc in scenarios],
+            "faculty": [sc.faculty_available for sc in scenarios],
+        },
+        params,
+    )
+
+
+# ---------------------------------------------------------
+# Excel input
+# ---------------------------------------------------------
+
+INPUT_COLUMNS = ("scenario_name", "total_rooms", "trainees", "crnas", "faculty")
+
+
+def check_input_columns(header):
+    """Raise ValueError if any of INPUT_COLUMNS is missing from header."""
+    missing = [c for c in INPUT_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+
+def blank_count_error(column):
+    """The error for a blank count in a scenario row (both readers)."""
+    return ValueError(f"Blank value in input column: {column}")
+
+
+def read_scenario_columns(input_file):
+    """
+    Read only INPUT_COLUMNS from the input sheet, keyed by column name.
+
+    With python-calamine installed this is pd.read_excel on the
+    Rust-based calamine engine, restricted to those columns. Otherwise
+    the sheet is streamed with openpyxl in read-only mode. Both readers
+    return the same thing: scenario names as a list (None for a blank
+    name) and the four counts as int64 arrays, with rows that are blank
+    in every input column skipped.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return read_scenario_columns_openpyxl(input_file)
+
+    import numpy as np
+    import pandas as pd
+
+    df = pd.read_excel(
+        input_file,
+        engine="calamine",
+        usecols=lambda c: c in INPUT_COLUMNS,
     )
+    check_input_columns(df.columns)
+
+    # No dtype hints: a blank name would become pd.NA under "string", and
+    # int64 columns cannot hold the blank rows that are dropped here
+    df = df.dropna(how="all")
+
+    columns = {
+        "scenario_name": [
+            None if pd.isna(v) else v for v in df["scenario_name"].tolist()
+        ],
+    }
+    for c in INPUT_COLUMNS[1:]:
+        if df[c].isna().any():
+            raise blank_count_error(c)
+        columns[c] = df[c].to_numpy(dtype=np.int64)
+
+    return columns
+
+
+def read_scenario_columns_openpyxl(input_file):
+    """
+    Stream the input sheet with openpyxl in read-only mode and return
+    its columns keyed by INPUT_COLUMNS (see read_scenario_columns; no
+    ScenarioInput objects or DataFrame).
+    """
+    import numpy as np
+    from openpyxl import load_workbook
+
+    wb = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        it = wb.active.iter_rows(values_only=True)
+        header = next(it, ())
+        idx = {h: i for i, h in enumerate(header) if h is not None}
+        check_input_columns(idx)
+
+        used = [idx[c] for c in INPUT_COLUMNS]
+        rows = [r for r in it if any(r[i] is not None for i in used)]
+    finally:
+        wb.close()
+
+    i_name = idx["scenario_name"]
+    columns = {"scenario_name": [r[i_name] for r in rows]}
+    for c in INPUT_COLUMNS[1:]:
+        i = idx[c]
+        values = [r[i] for r in rows]
+        if None in values:
+            raise blank_count_error(c)
+        columns[c] = np.array([int(v) for v in values], dtype=np.int64)
+
+    return columns
+
+
+# ---------------------------------------------------------
+# Output
+# ---------------------------------------------------------
+
+# Output goes straight from the compute_arrays result (column name ->
+# list or int64 array); no DataFrame is built on the way.
+
+def _rows(arrs):
+    """The arrs columns zipped into rows of plain Python values."""
+    columns = [c.tolist() if hasattr(c, "tolist") else c for c in arrs.values()]
+    return zip(*columns)
+
+
+def write_csv(arrs, output_file):
+    """Write arrs as CSV with a header row (same layout as DataFrame.to_csv)."""
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(arrs)
+        writer.writerows(_rows(arrs))
+
+
+def write_excel(arrs, output_file):
+    """
+    Write arrs with xlsxwriter directly instead of DataFrame.to_excel.
+
+    constant_memory streams each row to disk as it is finished, which
+    only works when rows are written in order, so the columns are
+    zipped back into rows here.
+    """
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(output_file, {"constant_memory": True})
+    ws = wb.add_worksheet()
+
+    ws.write_row(0, 0, list(arrs))
+    for r, row in enumerate(_rows(arrs), start=1):
+        ws.write_row(r, 0, row)
+
+    wb.close()
+
+
+def process_file(input_file, fmt="csv"):
+    """
+    Read one input workbook, run its scenarios and write the output
+    next to it (_input.xlsx -> _output.csv, or _output.xlsx for
+    fmt="xlsx"). Returns the output path.
+    """
+    columns = read_scenario_columns(input_file)
+
+    params = Parameters()
+    arrs = compute_arrays(columns, params)
+
+    output_file = input_file.replace("_input.xlsx", "_output.xlsx")
+
+    if fmt == "csv":
+        output_file = os.path.splitext(output_file)[0] + ".csv"
+        write_csv(arrs, output_file)
+    else:
+        write_excel(arrs, output_file)
+
+    return output_file
 
 
 # ---------------------------------------------------------
@@ -187,32 +429,48 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Run staffing model using Excel input"
     )
-    parser.add_argument("--input_file", required=True)
+    parser.add_argument(
+        "--input_file",
+        required=True,
+        nargs="+",
+        help="One or more input workbooks (glob patterns are expanded)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "xlsx"),
+        default="csv",
+        help="Output file format (default: csv, the fastest for plain data)",
+    )
 
     args = parser.parse_args()
-    input_file = args.input_file
-
-    if not os.path.exists(input_file):
-        print(f"ERROR: Input file not found: {input_file}")
-        sys.exit(1)
 
-    df_input = pd.read_excel(input_file)
+    input_files = []
+    for pattern in args.input_file:
+        input_files.extend(sorted(glob.glob(pattern)) or [pattern])
 
-    scenarios = [
-        ScenarioInput(
-            name=row["scenario_name"],
-            total_rooms=int(row["total_rooms"]),
-            trainees_available=int(row["trainees"]),
-            crnas_available=int(row["crnas"]),
-            faculty_available=int(row["faculty"]),
-        )
-        for _, row in df_input.iterrows()
-    ]
-
-    params = Parameters()
-    df_output = run_scenarios(scenarios, params)
+    missing = [f for f in input_files if not os.path.exists(f)]
+    if missing:
+        for input_file in missing:
+            print(f"ERROR: Input file not found: {input_file}")
+        sys.exit(1)
 
-    output_file = input_file.replace("_input.xlsx", "_output.xlsx")
-    df_output.to_excel(output_file, index=False)
+    try:
+        if len(input_files) == 1:
+            output_files = [process_file(input_files[0], args.format)]
+        else:
+            # Files are independent, so each one is a separate task;
+            # small files are handed out in chunks to amortize start-up
+            workers = min(len(input_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                output_files = list(pool.map(
+                    process_file,
+                    input_files,
+                    [args.format] * len(input_files),
+                    chunksize=ceil_div(len(input_files), workers * 4),
+                ))
+    except Exception as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
 
-    print(f"Results saved to {output_file}")
+    for output_file in output_files:
+        print(f"Results saved to {output_file}")